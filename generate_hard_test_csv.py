@@ -6,77 +6,86 @@ Roda: python generate_v3_test.py
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random, os, json
+import os, json
 
 os.makedirs("testes", exist_ok=True)
-np.random.seed(99)
-random.seed(99)
+rng = np.random.default_rng(99)
 
 n = 20000
-produtos   = ["Notebook Dell", "iPhone 15", "Monitor LG", "Teclado Mecânico", "Mouse Logitech"]
-cidades    = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre"]
-vendedores = ["João", "Maria", "Pedro", "Ana", "Carlos"]
-categorias = ["Eletrônicos", "Acessórios", "Periféricos"]
-regioes    = ["Sudeste", "Sul", "Nordeste", "Norte", "Centro-Oeste"]
-canais     = ["Online", "Loja Física", "Revendedor", "Televendas"]
-status_ok  = ["Concluída", "Pendente", "Cancelada"]
-
-# ── BASE LIMPA ────────────────────────────────────────────────────────────────
-produto_l  = [random.choice(produtos)   for _ in range(n)]
-cidade_l   = [random.choice(cidades)    for _ in range(n)]
-vendedor_l = [random.choice(vendedores) for _ in range(n)]
-cat_l      = [random.choice(categorias) for _ in range(n)]
-status_l   = [random.choice(status_ok)  for _ in range(n)]
-qtd_l      = [random.randint(1, 15)     for _ in range(n)]
-val_l      = [round(random.uniform(89.9, 8999.9), 2) for _ in range(n)]
-desc_l     = [round(random.uniform(0, 30), 1) for _ in range(n)]
-total_l    = [round(val_l[i] * qtd_l[i] * (1 - desc_l[i]/100), 2) for i in range(n)]
-
-df = pd.DataFrame({
-    "ID_Venda":       range(1, n+1),
-    "Data":           [(datetime(2024,1,1)+timedelta(days=random.randint(0,364)))
-                       .strftime(random.choice(["%d/%m/%Y","%Y-%m-%d","%d-%m-%Y"]))
-                       for _ in range(n)],
-    "Cliente":        [f"CLI-{random.randint(10000,99999)}" for _ in range(n)],
-    "Produto":        produto_l,
-    "Categoria":      cat_l,
-    "Regiao":         [random.choice(regioes)  for _ in range(n)],
-    "Canal_Venda":    [random.choice(canais)   for _ in range(n)],
-    "Vendedor":       vendedor_l,
-    "Cidade":         cidade_l,
+produtos   = np.array(["Notebook Dell", "iPhone 15", "Monitor LG", "Teclado Mecânico", "Mouse Logitech"])
+cidades    = np.array(["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre"])
+vendedores = np.array(["João", "Maria", "Pedro", "Ana", "Carlos"])
+categorias = np.array(["Eletrônicos", "Acessórios", "Periféricos"])
+regioes    = np.array(["Sudeste", "Sul", "Nordeste", "Norte", "Centro-Oeste"])
+canais     = np.array(["Online", "Loja Física", "Revendedor", "Televendas"])
+status_ok  = np.array(["Concluída", "Pendente", "Cancelada"])
+formatos   = ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"]
+
+# ── BASE LIMPA (vetorizada: uma chamada NumPy por coluna) ─────────────────────
+qtd_l   = rng.integers(1, 16, n)
+val_l   = np.round(rng.uniform(89.9, 8999.9, n), 2)
+desc_l  = np.round(rng.uniform(0, 30, n), 1)
+total_l = np.round(val_l * qtd_l * (1 - desc_l / 100), 2)
+
+# Datas: sorteia dia e formato por linha, formata cada formato uma única vez
+datas   = pd.Timestamp(2024, 1, 1) + pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+fmt_idx = rng.integers(0, len(formatos), n)
+data_l  = np.choose(fmt_idx, [np.asarray(datas.strftime(f), dtype=str) for f in formatos])
+
+base = {
+    "Data":           data_l,
+    "Cliente":        np.char.add("CLI-", rng.integers(10000, 100000, n).astype(str)),
+    "Produto":        rng.choice(produtos, n),
+    "Categoria":      rng.choice(categorias, n),
+    "Regiao":         rng.choice(regioes, n),
+    "Canal_Venda":    rng.choice(canais, n),
+    "Vendedor":       rng.choice(vendedores, n),
+    "Cidade":         rng.choice(cidades, n),
     "Valor_Unitario": val_l,
-    "Quantidade":     [str(q) for q in qtd_l],
+    "Quantidade":     qtd_l.astype(str),
     "Desconto_Pct":   desc_l,
     "Total_Venda":    total_l,
-    "Status":         status_l,
-    "Nota_Cliente":   [round(random.uniform(1.0,5.0),1) for _ in range(n)],
-    "Prazo_Entrega":  [random.randint(1,30) for _ in range(n)],
-    "Margem_Pct":     [round(random.uniform(5.0,45.0),1) for _ in range(n)],
-})
+    "Status":         rng.choice(status_ok, n),
+    "Nota_Cliente":   np.round(rng.uniform(1.0, 5.0, n), 1),
+    "Prazo_Entrega":  rng.integers(1, 31, n),
+    "Margem_Pct":     np.round(rng.uniform(5.0, 45.0, n), 1),
+}
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DESAFIO 1 — DUPLICATAS PARCIAIS (mesmos dados, ID diferente)
 # Mais difícil que duplicatas exatas — testa se o MCP detecta
 # ─────────────────────────────────────────────────────────────────────────────
-dup_parcial = df.iloc[200:350].copy()
-dup_parcial["ID_Venda"] = range(n+1, n+1+len(dup_parcial))  # ID diferente, resto igual
-df = pd.concat([df, dup_parcial], ignore_index=True)
-N_DUP_PARCIAL = len(dup_parcial)
+# Indexa as linhas 200:350 de novo ao final de cada coluna: o DataFrame já nasce
+# no tamanho final, sem pd.concat copiando a base inteira.
+linhas  = np.r_[np.arange(n), np.arange(200, 350)]
+colunas = {col: valores[linhas] for col, valores in base.items()}
+del base
+N_DUP_PARCIAL = len(linhas) - n
+
+# DESAFIOS 2 e 3 corrompem direto os arrays NumPy, antes de montar o DataFrame
+# (object: textos maiores que a largura fixa do array "<U10" original)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DESAFIO 2 — DATAS EM 4 FORMATOS + TIMESTAMPS
 # ─────────────────────────────────────────────────────────────────────────────
-df.loc[::9,  "Data"] = "inválida"
-df.loc[::41, "Data"] = "2024/06/15 14:30:00"         # timestamp ISO
-df.loc[::53, "Data"] = "15-Jun-2024"                  # formato inglês
+data = colunas["Data"] = colunas["Data"].astype(object)
+data[::9]  = "inválida"
+data[::41] = "2024/06/15 14:30:00"         # timestamp ISO
+data[::53] = "15-Jun-2024"                  # formato inglês
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DESAFIO 3 — TEXTO NUMÉRICO MISTO PT-BR + EN
 # ─────────────────────────────────────────────────────────────────────────────
-df.loc[::19, "Quantidade"] = "dez"
-df.loc[::29, "Quantidade"] = "five"       # inglês — NÃO deve converter
-df.loc[::37, "Quantidade"] = "12.0"       # float como string
+qtd = colunas["Quantidade"] = colunas["Quantidade"].astype(object)
+qtd[::19] = "dez"
+qtd[::29] = "five"       # inglês — NÃO deve converter
+qtd[::37] = "12.0"       # float como string
+
+df = pd.DataFrame({
+    "ID_Venda": np.arange(1, len(linhas)+1),  # ID diferente, resto igual
+    **colunas,
+})
+del colunas, data, qtd
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DESAFIO 4 — NORMALIZAÇÃO DE TEXTO (5 variantes de cidade)
@@ -91,18 +100,18 @@ df.loc[4000:4003,"Cidade"] = "SP"              # sigla — NÃO normalizar
 # DESAFIO 5 — OUTLIERS EM 3 COLUNAS DIFERENTES
 # ─────────────────────────────────────────────────────────────────────────────
 # Outliers em Total_Venda
-for i in [100,500,1000,3000,7000,12000,15000,18000,19000]:
-    if i < len(df): df.loc[i,"Total_Venda"] = round(random.uniform(120000,250000),2)
-for i in [200,600,1500,5000,9000]:
-    if i < len(df): df.loc[i,"Total_Venda"] = round(random.uniform(0.01,0.99),2)
+idx = [i for i in [100,500,1000,3000,7000,12000,15000,18000,19000] if i < len(df)]
+df.loc[idx, "Total_Venda"] = np.round(rng.uniform(120000, 250000, len(idx)), 2)
+idx = [i for i in [200,600,1500,5000,9000] if i < len(df)]
+df.loc[idx, "Total_Venda"] = np.round(rng.uniform(0.01, 0.99, len(idx)), 2)
 
 # Outliers em Prazo_Entrega (entregas impossíveis)
-for i in [300,800,2000,4000]: 
-    if i < len(df): df.loc[i,"Prazo_Entrega"] = random.randint(180,365)
+idx = [i for i in [300,800,2000,4000] if i < len(df)]
+df.loc[idx, "Prazo_Entrega"] = rng.integers(180, 366, len(idx))
 
 # Outliers em Margem_Pct (margens impossíveis)
-for i in [400,900,2500]: 
-    if i < len(df): df.loc[i,"Margem_Pct"] = round(random.uniform(95.0,150.0),1)
+idx = [i for i in [400,900,2500] if i < len(df)]
+df.loc[idx, "Margem_Pct"] = np.round(rng.uniform(95.0, 150.0, len(idx)), 1)
 
 N_OUTLIERS_VENDA   = 9 + 5
 N_OUTLIERS_PRAZO   = 4
@@ -153,10 +162,12 @@ df.loc[idx_online, "Total_Venda"] = (df.loc[idx_online, "Total_Venda"] * 3.8).ro
 # ─────────────────────────────────────────────────────────────────────────────
 # DESAFIO 10 — NaN ESTRATÉGICOS EM COLUNAS CRÍTICAS
 # ─────────────────────────────────────────────────────────────────────────────
-df.loc[::13, "Valor_Unitario"] = np.nan
-df.loc[::41, "Margem_Pct"]    = np.nan
-df.loc[::53, "Status"]        = ""
-df.loc[::61, "Nota_Cliente"]  = np.nan
+# Posicional (iloc) — roda depois do DESAFIO 7, que também escreve em Status
+pos = df.columns.get_loc
+df.iloc[::13, pos("Valor_Unitario")] = np.nan
+df.iloc[::41, pos("Margem_Pct")]    = np.nan
+df.iloc[::53, pos("Status")]        = ""
+df.iloc[::61, pos("Nota_Cliente")]  = np.nan
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SALVA
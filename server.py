@@ -15,18 +15,26 @@ Por que isso resolve o problema de 20k linhas:
 import sys
 import os
 import json
-import hashlib
+import codecs
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 from fastmcp import FastMCP
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
 
 mcp = FastMCP("DataClaw", version="3.0.0")
 
-_CACHE: dict[str, tuple] = {}
+_CACHE: dict[tuple, tuple] = {}
+_DATES_CACHE: dict[tuple, pd.Series] = {}
 _CACHE_LIMIT = 3
+_CACHE_LOCK  = threading.Lock()
 
 BASE_DIR   = Path(__file__).parent.resolve()
 OUTPUT_DIR = BASE_DIR / "outputs"
@@ -37,23 +45,62 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 # UTILITÁRIOS INTERNOS — pandas puro, zero LLM
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _cache_key(path: str) -> str:
-    return hashlib.md5(path.encode()).hexdigest()[:8]
+def _cache_key(path: str) -> tuple:
+    """Chave (caminho, mtime, tamanho): arquivo alterado em disco invalida o cache."""
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
 
 
-def _detect_format(file_path: str) -> tuple:
-    """Detecta separador, decimal e encoding lendo apenas 4KB."""
+_BOMS = [
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe",     "utf-16"),
+    (b"\xfe\xff",     "utf-16"),
+]
+
+
+def _sniff_encoding(sample: bytes) -> str:
+    """BOM primeiro; senão a primeira codificação que decodifica a amostra."""
+    for bom, enc in _BOMS:
+        if sample.startswith(bom):
+            return enc
     for enc in ["utf-8", "latin-1", "cp1252"]:
         try:
-            with open(file_path, "r", encoding=enc, errors="strict") as f:
-                sample = f.read(4096)
-            counts = {s: sample.count(s) for s in [";", ",", "\t"]}
-            sep     = max(counts, key=counts.get)
-            decimal = "," if sep == ";" else "."
-            return sep, decimal, enc
-        except Exception:
+            # final=False: tolera um caractere multibyte cortado no fim da amostra
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
             continue
-    return ",", ".", "utf-8"
+    return "utf-8"
+
+
+def _detect_format(file_path: str) -> tuple:
+    """Detecta separador, decimal e encoding lendo apenas 16KB, uma única vez."""
+    try:
+        with open(file_path, "rb") as f:
+            raw = f.read(16384)
+    except OSError:
+        return ",", ".", "utf-8"
+
+    enc     = _sniff_encoding(raw)
+    sample  = raw.decode(enc, errors="ignore")
+    counts  = {s: sample.count(s) for s in [";", ",", "\t"]}
+    sep     = max(counts, key=counts.get)
+    decimal = "," if sep == ";" else "."
+    return sep, decimal, enc
+
+
+def _count_rows(file_path: str, enc: str) -> int:
+    """Linhas de dados (sem o cabeçalho), contando b"\n" em blocos de 1MB sem decodificar."""
+    if enc.startswith("utf-16"):
+        with open(file_path, "r", encoding=enc, errors="replace") as f:
+            return sum(1 for _ in f) - 1
+    n, last = 0, b"\n"
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            n   += chunk.count(b"\n")
+            last = chunk[-1:]
+    # última linha sem \n final também conta
+    return n - (last == b"\n")
 
 
 _PTBR = {
@@ -64,19 +111,65 @@ _PTBR = {
     "dezoito":18,"dezenove":19,"vinte":20
 }
 
-def _coerce_numeric(series: pd.Series, threshold: float = 0.75) -> pd.Series:
-    """Converte object→número com segurança. Resolve PT-BR ('dez'→10)."""
-    mapped = series.astype(str).str.strip().str.lower().map(
-        lambda x: str(_PTBR[x]) if x in _PTBR else x
-    )
-    cleaned = (
-        mapped
-        .str.replace(r"[^\d.,\-]", "", regex=True)
-        .str.replace(",", ".", regex=False)
-    )
-    converted = pd.to_numeric(cleaned, errors="coerce")
-    ratio = converted.notna().sum() / max(len(series.dropna()), 1)
-    return converted if ratio >= threshold else series
+_PTBR_KEYS      = pa.array(list(_PTBR))
+_PTBR_VALUES    = pa.array([str(v) for v in _PTBR.values()])
+_NON_NUMERIC_RE = r"[^\d.,\-]"
+
+
+def _arrow_text(series: pd.Series) -> pa.Array:
+    return pa.array(series, type=pa.string(), from_pandas=True)
+
+
+def _clean_numeric_text(values: pa.ChunkedArray) -> pd.Series:
+    """Caminho lento, vetorizado no Arrow: PT-BR por extenso + remoção de símbolos ('R$ 1,5'→'1.5')."""
+    lowered = pc.utf8_lower(pc.utf8_trim_whitespace(values))
+    idx     = pc.index_in(lowered, value_set=_PTBR_KEYS)
+    mapped  = pc.if_else(pc.is_valid(idx), pc.take(_PTBR_VALUES, idx), lowered)
+    cleaned = pc.replace_substring_regex(mapped, _NON_NUMERIC_RE, "")
+    return pc.replace_substring(cleaned, ",", ".").to_pandas()
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Coluna já textual volta como está; só as demais pagam a cópia de astype(str)."""
+    return series if pd.api.types.is_string_dtype(series) else series.astype(str)
+
+
+def _coerce_numeric(df: pd.DataFrame, threshold: float = 0.75) -> pd.DataFrame:
+    """
+    Converte colunas object→número com segurança. Resolve PT-BR ('dez'→10).
+    Amostra de 50 valores descarta colunas de texto; to_numeric direto resolve
+    a maioria das células. As rejeitadas de TODAS as colunas passam juntas por
+    uma única limpeza no Arrow, em vez de um regex por coluna.
+    """
+    pending = {}
+    for col in df.select_dtypes(include=["object","string"]).columns:
+        non_null = df[col].dropna()
+        if non_null.empty:
+            continue
+        sample = _clean_numeric_text(pa.chunked_array([_arrow_text(_as_text(non_null.iloc[:50]))]))
+        if pd.to_numeric(sample, errors="coerce").notna().mean() < 0.5:
+            continue
+
+        text      = _as_text(df[col]).str.strip().str.replace(",", ".", regex=False)
+        converted = pd.to_numeric(text, errors="coerce")
+        # inf/-inf/Infinity passam no to_numeric; a limpeza antiga os zerava em NaN
+        failed    = ~np.isfinite(converted) & df[col].notna()
+        pending[col] = (text, converted, failed)
+
+    parts   = [text[failed] for text, _, failed in pending.values() if failed.any()]
+    cleaned = (_clean_numeric_text(pa.chunked_array([_arrow_text(p) for p in parts], pa.string()))
+               .to_numpy() if parts else None)
+
+    offset = 0
+    for col, (text, converted, failed) in pending.items():
+        n_failed = int(failed.sum())
+        if n_failed:
+            text[failed] = cleaned[offset:offset + n_failed]
+            converted    = pd.to_numeric(text, errors="coerce")
+            offset      += n_failed
+        if converted.notna().sum() / df[col].notna().sum() >= threshold:
+            df[col] = converted
+    return df
 
 
 def _normalize_text(series: pd.Series) -> pd.Series:
@@ -86,61 +179,224 @@ def _normalize_text(series: pd.Series) -> pd.Series:
     return series.astype(str).str.strip().str.title()
 
 
-def _load(file_path: str) -> tuple:
+def _skip_long_rows(row) -> str:
+    """
+    Linha com campos a mais: descarta, como o on_bad_lines="skip" do pandas.
+    Linha curta o pandas mantém (com NaN); o pyarrow só sabe descartar, então
+    aborta a leitura e _load cai no pd.read_csv.
+    """
+    return "skip" if row.actual_columns > row.expected_columns else "error"
+
+
+# Nulos padrão do pd.read_csv (pandas._libs.parsers.STR_NA_VALUES); o default
+# do pyarrow não tem "None" nem "<NA>"
+_PANDAS_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN",
+                     "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL",
+                     "NaN", "None", "n/a", "nan", "null"]
+
+
+def _read_arrow(file_path: str, sep: str, decimal: str, enc: str,
+                use_threads: bool = True) -> pd.DataFrame:
+    """
+    Leitura multithread com o parser CSV do pyarrow, equivalente ao
+    pd.read_csv(sep=, decimal=, on_bad_lines="skip") usado antes.
+    O pyarrow não tem opção decimal=",": colunas texto cuja amostra vira número
+    com vírgula→ponto são convertidas inteiras em float64.
+    """
+    def read(column_types=None):
+        return pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(encoding=enc, block_size=8 << 20,
+                                            use_threads=use_threads),
+            parse_options=pa_csv.ParseOptions(delimiter=sep,
+                                              invalid_row_handler=_skip_long_rows),
+            convert_options=pa_csv.ConvertOptions(strings_can_be_null=True,
+                                                  null_values=_PANDAS_NA_VALUES,
+                                                  column_types=column_types),
+        )
+
+    table = read()
+    if "" in table.column_names:
+        # Cabeçalho vazio (ex.: ";" no fim da linha) vira "Unnamed: N" no pandas
+        table = table.rename_columns([name or f"Unnamed: {i}"
+                                      for i, name in enumerate(table.column_names)])
+    if len(set(table.column_names)) != table.num_columns:
+        # Cabeçalho repetido: só o pandas renomeia (a, a.1)
+        raise pa.ArrowInvalid("nomes de coluna duplicados")
+
+    # pandas mantém datas como texto original; cast para string reformataria
+    # ("2024-01-05 10:00" → "2024-01-05 10:00:00"), então relê essas como texto
+    temporal = [f.name for f in table.schema if pa.types.is_temporal(f.type)]
+    if temporal:
+        table = read({name: pa.string() for name in temporal})
+
+    columns = []
+    for col in table.columns:
+        if pa.types.is_null(col.type):
+            # Coluna toda vazia: float64 de NaN, como no pandas
+            col = col.cast(pa.float64())
+        elif pa.types.is_string(col.type) and decimal != ".":
+            try:
+                pc.cast(pc.replace_substring(col.slice(0, 100), decimal, "."), pa.float64())
+                col = pc.cast(pc.replace_substring(col, decimal, "."), pa.float64())
+            except pa.ArrowInvalid:
+                pass
+        columns.append(col)
+    return pa.table(columns, names=table.column_names).to_pandas()
+
+
+def _load(file_path: str, use_threads: bool = True, key: tuple = None) -> tuple:
     """
     Retorna (df_raw, df_clean).
     df_raw:  original — para métricas brutas
     df_clean: limpo e normalizado — para todas as análises
-    Usa cache para evitar releitura.
+    Usa cache para evitar releitura. Os DataFrames retornados são compartilhados
+    entre chamadas — quem consome NÃO deve modificá-los in-place.
+    key: _cache_key já calculado pelo chamador (para reusar em _load_dates).
     """
-    key = _cache_key(file_path)
-    if key in _CACHE:
-        return _CACHE[key]
+    key    = key or _cache_key(file_path)
+    cached = _CACHE.get(key)   # leitura única: outra thread pode despejar a chave
+    if cached is not None:
+        return cached
 
     sep, decimal, enc = _detect_format(file_path)
 
-    with open(file_path, "r", encoding=enc, errors="replace") as f:
-        total_lines = sum(1 for _ in f) - 1
+    try:
+        df_raw = _read_arrow(file_path, sep, decimal, enc, use_threads)
+    except (pa.ArrowException, UnicodeError):
+        total_lines = _count_rows(file_path, enc)
 
-    kw = dict(sep=sep, decimal=decimal, encoding=enc,
-              on_bad_lines="skip", low_memory=False)
+        kw = dict(sep=sep, decimal=decimal, encoding=enc,
+                  on_bad_lines="skip", low_memory=False)
 
-    if total_lines <= 50_000:
-        df_raw = pd.read_csv(file_path, **kw)
-    else:
-        chunks = [c for c in pd.read_csv(file_path, chunksize=5000, **kw)]
-        df_raw = pd.concat(chunks, ignore_index=True)
+        if total_lines <= 50_000:
+            df_raw = pd.read_csv(file_path, **kw)
+        else:
+            chunks = [c for c in pd.read_csv(file_path, chunksize=5000, **kw)]
+            df_raw = pd.concat(chunks, ignore_index=True)
 
+    # drop_duplicates já fatoriza coluna a coluna em C; hash por linha
+    # (hash_pandas_object/xxhash + duplicated) mediu ~2.5x mais lento aqui.
     df_clean = df_raw.drop_duplicates().dropna(how="all").reset_index(drop=True)
 
     # Converte numéricos (resolve "dez" → 10)
-    for col in df_clean.select_dtypes(include=["object","string"]).columns:
-        df_clean[col] = _coerce_numeric(df_clean[col])
+    df_clean = _coerce_numeric(df_clean)
 
     # Normaliza categóricas (resolve "são paulo" → "São Paulo")
     for col in df_clean.select_dtypes(include=["object","string"]).columns:
         if df_clean[col].nunique() < 200:
             df_clean[col] = _normalize_text(df_clean[col])
 
-    if len(_CACHE) >= _CACHE_LIMIT:
-        del _CACHE[next(iter(_CACHE))]
-    _CACHE[key] = (df_raw, df_clean)
+    # Baixa cardinalidade → category (groupby/value_counts por códigos inteiros)
+    max_unique = max(32, int(0.05 * len(df_clean)))
+    for col in df_clean.select_dtypes(include=["object","string"]).columns:
+        if df_clean[col].nunique() <= max_unique:
+            df_clean[col] = df_clean[col].astype("category")
+
+    # Inteiros no menor tipo que os comporta (sem perda). Floats ficam em
+    # float64: somas financeiras em float32 perdem centavos já na casa dos milhões.
+    for col in df_clean.select_dtypes(include="integer").columns:
+        df_clean[col] = pd.to_numeric(df_clean[col], downcast="integer")
+
+    with _CACHE_LOCK:
+        if len(_CACHE) >= _CACHE_LIMIT:
+            del _CACHE[next(iter(_CACHE))]
+        _CACHE[key] = (df_raw, df_clean)
     return df_raw, df_clean
 
 
-def _find_col(df: pd.DataFrame, keywords: list[str],
-              dtype_filter: str = None) -> str | None:
-    """Encontra coluna por keywords no nome."""
-    num_cols = set(df.select_dtypes(include="number").columns)
+def _load_many(file_paths: list[str]) -> list[tuple]:
+    """
+    Carrega vários CSVs em paralelo (ex.: uma pasta inteira), na ordem recebida.
+    O parser do pyarrow libera o GIL, então threads bastam; cada arquivo lê
+    com uma thread só para não disputar núcleos com o pool.
+    Ainda sem chamador: nenhuma tool recebe vários arquivos. API interna
+    pronta para uma tool de pasta/lote.
+    """
+    unique  = list(dict.fromkeys(file_paths))
+    workers = min(len(unique), os.cpu_count() or 1)
+    if workers <= 1:
+        # Um arquivo (ou um núcleo): sem pool, o pyarrow usa as próprias threads
+        loaded = {p: _load(p) for p in unique}
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            loaded = dict(zip(unique, ex.map(lambda p: _load(p, use_threads=False), unique)))
+    return [loaded[p] for p in file_paths]
+
+
+_DATE_FORMATS = ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%Y/%m/%d %H:%M:%S", "%d-%b-%Y"]
+
+def _parse_dates(series: pd.Series) -> pd.Series:
+    """
+    Converte datas em formatos misturados. Cada formato conhecido roda com
+    format= explícito (caminho rápido em C) sobre as linhas ainda pendentes,
+    na ordem de acertos numa amostra de 200 valores. O parser genérico
+    (elemento a elemento) só roda no resto.
+    """
+    if not (pd.api.types.is_string_dtype(series)
+            or isinstance(series.dtype, pd.CategoricalDtype)):
+        return pd.to_datetime(series, errors="coerce", dayfirst=True)
+
+    text   = series.astype(object)
+    sample = text.dropna().iloc[:200]
+    hits   = {f: pd.to_datetime(sample, format=f, errors="coerce").notna().sum()
+              for f in _DATE_FORMATS}
+
+    # O primeiro resultado define o dtype: mantém a unidade inferida pelo pandas
+    # (um "9999-12-31" estoura datetime64[ns])
+    first, *others = sorted(_DATE_FORMATS, key=hits.get, reverse=True)
+    parsed  = pd.to_datetime(text, format=first, errors="coerce")
+    pending = series.notna() & parsed.isna()
+    for fmt in others:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+        pending &= parsed.isna()
+
+    if pending.any():
+        # Sem amostra: lixo no início do resto não pode esconder datas válidas.
+        # to_datetime já parseia só os valores únicos (cache=True).
+        parsed[pending] = pd.to_datetime(text[pending], errors="coerce",
+                                         format="mixed", dayfirst=True)
+    return parsed
+
+
+def _load_dates(file_key: tuple, df: pd.DataFrame, date_col: str) -> pd.Series:
+    """
+    Datas já parseadas de df[date_col], em cache junto com o arquivo.
+    file_key é a mesma chave com que _load obteve df — um novo os.stat aqui
+    guardaria datas do frame antigo sob a chave do arquivo já alterado.
+    """
+    key   = (file_key, date_col)
+    dates = _DATES_CACHE.get(key)
+    if dates is None:
+        dates = _parse_dates(df[date_col])
+        with _CACHE_LOCK:
+            if len(_DATES_CACHE) >= _CACHE_LIMIT:
+                del _DATES_CACHE[next(iter(_DATES_CACHE))]
+            _DATES_CACHE[key] = dates
+    return dates
+
+
+@lru_cache(maxsize=32)
+def _match_col(columns: tuple, keywords: tuple) -> str | None:
+    """Primeira coluna que contém a keyword, na ordem de prioridade das keywords."""
     for kw in keywords:
-        for col in df.columns:
+        for col in columns:
             if kw in col.lower():
-                if dtype_filter == "numeric" and col not in num_cols:
-                    continue
                 return col
     return None
 
 
+def _find_col(df: pd.DataFrame, keywords: list[str],
+              dtype_filter: str = None) -> str | None:
+    """Encontra coluna por keywords no nome. Memoizado pelos nomes de coluna."""
+    columns = df.columns
+    if dtype_filter == "numeric":
+        columns = df.select_dtypes(include="number").columns
+    return _match_col(tuple(columns), tuple(keywords))
+
+
 def _safe(val):
     """Converte tipos numpy para Python nativo (para json.dumps)."""
     if isinstance(val, (np.integer,)):  return int(val)
@@ -154,12 +410,14 @@ def _to_json(data: dict) -> str:
     """Serializa dict para JSON com indentação. Limite de 3500 chars."""
     raw = json.dumps(data, ensure_ascii=False, indent=2, default=_safe)
     if len(raw) > 3500:
-        # Trunca listas longas antes de serializar novamente
-        for k, v in data.items():
-            if isinstance(v, list) and len(v) > 8:
-                data[k] = v[:8]
-                data[f"{k}_truncated"] = True
-        raw = json.dumps(data, ensure_ascii=False, indent=2, default=_safe)
+        # Trunca listas longas antes de serializar novamente — só re-serializa
+        # se algo foi de fato truncado
+        long_lists = [k for k, v in data.items() if isinstance(v, list) and len(v) > 8]
+        for k in long_lists:
+            data[k] = data[k][:8]
+            data[f"{k}_truncated"] = True
+        if long_lists:
+            raw = json.dumps(data, ensure_ascii=False, indent=2, default=_safe)
     return raw
 
 
@@ -187,8 +445,7 @@ def csv_info(file_path: str) -> str:
         df = pd.read_csv(file_path, sep=sep, decimal=decimal,
                          encoding=enc, nrows=2000, on_bad_lines="skip")
 
-        with open(file_path, "r", encoding=enc, errors="replace") as f:
-            total_lines = sum(1 for _ in f) - 1
+        total_lines = _count_rows(file_path, enc)
 
         columns = []
         for col in df.columns:
@@ -234,7 +491,8 @@ def analyze_csv(
         focus: "full" | "financial" | "quality" | "trends" | "ranking"
     """
     try:
-        df_raw, df = _load(file_path)
+        file_key   = _cache_key(file_path)
+        df_raw, df = _load(file_path, key=file_key)
 
         value_col = _find_col(df, ["total_venda","total","receita","faturamento",
                                    "revenue","amount","valor","price"], "numeric")
@@ -262,14 +520,19 @@ def analyze_csv(
             "null_pct":                   round(null_cells / total_cells * 100, 2),
         }
 
+        # Coluna de valor como array float64 contíguo, extraído uma vez só
+        # e reaproveitado pelos blocos financeiro e de outliers (só quando rodam)
+        values = (df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+                  if value_col and focus in ["full", "financial"] else None)
+
         # ── BLOCO: financeiro ────────────────────────────────────────────────
         if value_col and focus in ["full", "financial"]:
             t_bruto = float(df_raw[value_col].sum())
-            t_limpo = float(df[value_col].sum())
-            media   = float(df[value_col].mean())
-            maximo  = float(df[value_col].max())
-            minimo  = float(df[value_col].min())
-            nulos   = int(df[value_col].isna().sum())
+            t_limpo = float(np.nansum(values))
+            media   = float(np.nanmean(values))
+            maximo  = float(np.nanmax(values))
+            minimo  = float(np.nanmin(values))
+            nulos   = int(np.count_nonzero(np.isnan(values)))
 
             result["financial"] = {
                 "value_column":                      value_col,
@@ -286,8 +549,8 @@ def analyze_csv(
 
         # ── BLOCO: datas e tendência ─────────────────────────────────────────
         if date_col and focus in ["full", "trends"]:
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce", dayfirst=True)
-            valid    = df[date_col].notna()
+            dates    = _load_dates(file_key, df, date_col)
+            valid    = dates.notna()
             inv_n    = int((~valid).sum())
             inv_pct  = round(inv_n / len(df) * 100, 2)
 
@@ -300,26 +563,30 @@ def analyze_csv(
             }
 
             if valid.sum() > 0 and value_col:
+                # Chave inteira (meses desde 1970) em vez de Period por linha
+                month_key = dates[valid].to_numpy().astype("datetime64[M]").view("int64")
                 monthly = (
-                    df[valid]
-                    .groupby(df.loc[valid, date_col].dt.to_period("M"))[value_col]
+                    df.loc[valid, value_col]
+                    .groupby(month_key)
                     .agg(total="sum", count="count")
                     .round(2)
                     .tail(12)
                 )
-                trend = []
-                for period, row in monthly.iterrows():
-                    trend.append({
-                        "month":              str(period),
-                        "total_revenue":      round(float(row["total"]), 2),
-                        "transaction_count":  int(row["count"])
-                    })
+                labels = np.datetime_as_string(monthly.index.to_numpy().astype("datetime64[M]"))
+                trend = [
+                    {
+                        "month":              str(label),
+                        "total_revenue":      round(float(total), 2),
+                        "transaction_count":  int(count)
+                    }
+                    for label, total, count in zip(labels, monthly["total"], monthly["count"])
+                ]
                 result["monthly_trend"] = trend
 
         # ── BLOCO: rankings ──────────────────────────────────────────────────
         if cat_col and focus in ["full", "ranking"]:
             if value_col:
-                top = (df.groupby(cat_col)[value_col]
+                top = (df.groupby(cat_col, observed=True)[value_col]
                          .sum()
                          .sort_values(ascending=False)
                          .head(8))
@@ -337,44 +604,45 @@ def analyze_csv(
 
         # ── BLOCO: outliers (IQR + Z-score duplo) ───────────────────────────
         if value_col and focus in ["full", "financial"]:
-            col_data = df[value_col].dropna()
+            # Contagens direto no array NumPy — sem materializar DataFrames de outliers
+            arr = values
 
             # IQR
-            q1, q3 = col_data.quantile([0.25, 0.75])
+            q1, q3 = np.nanquantile(arr, [0.25, 0.75])
             iqr    = q3 - q1
             lo_iqr = float(q1 - 1.5 * iqr)
             hi_iqr = float(q3 + 1.5 * iqr)
-            out_iqr = df[(df[value_col] < lo_iqr) | (df[value_col] > hi_iqr)]
+            n_out_iqr = int(np.count_nonzero((arr < lo_iqr) | (arr > hi_iqr)))
 
             # Z-score (detecta outliers extremos que IQR pode perder)
-            z_scores = (col_data - col_data.mean()) / col_data.std()
-            out_z    = df.loc[col_data.index[z_scores.abs() > 3]]
+            # |x - média| > 3σ  ≡  |z| > 3, sem dividir
+            n_out_z = int(np.count_nonzero(
+                np.abs(arr - np.nanmean(arr)) > 3 * np.nanstd(arr, ddof=1)
+            ))
 
             # Top 5 outliers mais extremos para inspeção
-            top_outliers = (
-                df.nlargest(5, value_col)[[value_col] + ([cat_col] if cat_col else [])]
-                .reset_index(drop=True)
-            )
+            top_outliers = df.nlargest(5, value_col)
+            top_cats     = top_outliers[cat_col] if cat_col else [None] * len(top_outliers)
             extreme = [
                 {
                     "rank": i+1,
-                    "value": round(float(row[value_col]), 2),
-                    "category": str(row[cat_col]) if cat_col and cat_col in row else None
+                    "value": round(float(value), 2),
+                    "category": str(cat) if cat_col else None
                 }
-                for i, row in top_outliers.iterrows()
+                for i, (value, cat) in enumerate(zip(top_outliers[value_col], top_cats))
             ]
 
             result["outliers"] = {
                 "method_iqr": {
                     "normal_range_min": round(lo_iqr, 2),
                     "normal_range_max": round(hi_iqr, 2),
-                    "outliers_count":   len(out_iqr),
-                    "outliers_pct":     round(len(out_iqr) / len(df) * 100, 2)
+                    "outliers_count":   n_out_iqr,
+                    "outliers_pct":     round(n_out_iqr / len(df) * 100, 2)
                 },
                 "method_zscore": {
                     "threshold":       "z > 3",
-                    "outliers_count":  len(out_z),
-                    "outliers_pct":    round(len(out_z) / len(df) * 100, 2)
+                    "outliers_count":  n_out_z,
+                    "outliers_pct":    round(n_out_z / len(df) * 100, 2)
                 },
                 "top_5_extreme_values": extreme
             }
@@ -382,9 +650,9 @@ def analyze_csv(
         # ── BLOCO: anomalias por categoria (Carlos suspeito, etc) ────────────
         if status_col and cat_col and focus in ["full", "ranking"]:
             cancel_vals = ["cancelada", "cancelado", "cancelled", "canceled"]
-            df["_is_cancel"] = df[status_col].astype(str).str.lower().str.strip().isin(cancel_vals)
+            is_cancel = df[status_col].astype(str).str.lower().str.strip().isin(cancel_vals)
 
-            cancel_by_cat = df.groupby(cat_col)["_is_cancel"].agg(
+            cancel_by_cat = is_cancel.groupby(df[cat_col], observed=True).agg(
                 total="count", cancellations="sum"
             )
             cancel_by_cat["cancel_rate_pct"] = (
@@ -396,19 +664,21 @@ def analyze_csv(
             threshold = mean_rate + 1.5 * std_rate
 
             anomalies = []
-            for name, row in cancel_by_cat.iterrows():
-                rate = float(row["cancel_rate_pct"])
+            for name, total, cancels, rate in zip(cancel_by_cat.index,
+                                                  cancel_by_cat["total"],
+                                                  cancel_by_cat["cancellations"],
+                                                  cancel_by_cat["cancel_rate_pct"]):
+                rate = float(rate)
                 anomalies.append({
                     "name":                str(name),
-                    "total_sales":         int(row["total"]),
-                    "cancellations":       int(row["cancellations"]),
+                    "total_sales":         int(total),
+                    "cancellations":       int(cancels),
                     "cancel_rate_pct":     rate,
                     "is_anomaly":          rate > threshold,
                     "deviation_from_mean": round(rate - mean_rate, 2)
                 })
 
             anomalies.sort(key=lambda x: x["cancel_rate_pct"], reverse=True)
-            df.drop(columns=["_is_cancel"], inplace=True)
 
             result[f"cancellation_analysis_by_{cat_col}"] = {
                 "team_average_cancel_rate_pct": round(mean_rate, 2),
@@ -432,12 +702,12 @@ def analyze_csv(
 
         # ── BLOCO: sazonalidade por categoria ────────────────────────────────
         if date_col and value_col and cat_col and focus in ["full", "trends"]:
-            if df[date_col].notna().sum() > 0:
-                valid_df = df[df[date_col].notna()].copy()
+            if valid.sum() > 0:
+                valid_df = df[valid].assign(**{date_col: dates[valid]})
 
                 # Coeficiente de variação mensal por categoria
                 seasonal = []
-                for name, grp in valid_df.groupby(cat_col):
+                for name, grp in valid_df.groupby(cat_col, observed=True):
                     monthly_rev = (
                         grp.groupby(grp[date_col].dt.month)[value_col].sum()
                     )
@@ -522,23 +792,26 @@ def query_csv(
             agg_func = metric if metric in ["sum","mean","count","min","max"] else "sum"
 
             if not num_cols:
-                counts = df[group_by].value_counts().head(top_n)
+                counts = df[group_by].value_counts()
+                counts = counts[counts > 0].head(top_n)   # category: omite níveis filtrados
                 rows   = [{"rank": i+1, "name": str(k), "count": int(v)}
                           for i, (k, v) in enumerate(counts.items())]
             else:
                 grouped = (
-                    df.groupby(group_by)[num_cols]
+                    df.groupby(group_by, observed=True)[num_cols]
                     .agg(agg_func)
                     .round(2)
                     .sort_values(num_cols[0], ascending=False)
                     .head(top_n)
                     .reset_index()
                 )
+                # Colunas como listas Python: sem montar uma Series por linha
+                columns = {col: grouped[col].tolist() for col in num_cols}
                 rows = []
-                for i, row in grouped.iterrows():
-                    entry = {"rank": i+1, "name": str(row[group_by])}
+                for i, name in enumerate(grouped[group_by].tolist()):
+                    entry = {"rank": i+1, "name": str(name)}
                     for col in num_cols:
-                        entry[col] = _safe(row[col])
+                        entry[col] = _safe(columns[col][i])
                     rows.append(entry)
         else:
             rows = df.head(top_n).to_dict(orient="records")
@@ -572,10 +845,9 @@ def clean_csv(file_path: str, output_name: str = "") -> str:
     """
     try:
         file_path = os.path.expanduser(file_path)
-        sep, decimal, enc = _detect_format(file_path)
+        sep, decimal, _ = _detect_format(file_path)
 
-        df_raw = pd.read_csv(file_path, sep=sep, decimal=decimal,
-                             encoding=enc, on_bad_lines="skip", low_memory=False)
+        df_raw, _ = _load(file_path)   # reaproveita a leitura de analyze/query
         n_raw  = len(df_raw)
 
         df_clean = df_raw.drop_duplicates().dropna(how="all").reset_index(drop=True)